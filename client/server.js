@@ -20,9 +20,39 @@ const db = new sqlite3.Database(DB_PATH, sqlite3.OPEN_READONLY, (err) => {
         console.error(`Error opening database at ${DB_PATH}: ${err.message}`);
     } else {
         console.log('Connected to archive database.');
+        // Memory-map up to 256MB of the archive so reads go through the OS
+        // page cache directly instead of being copied into SQLite's buffers.
+        db.exec('PRAGMA mmap_size = 268435456;', (err) => {
+            if (err) console.error('Failed to enable mmap:', err.message);
+        });
+        prepareStatements();
     }
 });
 
+// Fixed queries prepared once the pages table is confirmed to exist; each
+// request then only rebinds parameters instead of re-parsing and re-planning
+// the SQL. They stay null until then -- preparing against a fresh/empty
+// archive.db would raise unhandled 'error' events on the statements and crash
+// the reader. (The FTS query is not prepared because pages_fts may not exist.)
+let fallbackSearchStmt = null;
+let recentStmt = null;
+let viewStmt = null;
+
+function prepareStatements() {
+    db.get("SELECT name FROM sqlite_master WHERE type='table' AND name='pages'", (err, row) => {
+        if (err || !row) {
+            console.error('Archive database has no pages table yet; search and view will return errors until it is built.');
+            return;
+        }
+        const logPrepareError = (err) => {
+            if (err) console.error('Error preparing statement:', err.message);
+        };
+        fallbackSearchStmt = db.prepare(`SELECT id, title, url, timestamp FROM pages WHERE title LIKE ? OR url LIKE ? LIMIT 50`, logPrepareError);
+        recentStmt = db.prepare(`SELECT id, title, url, timestamp FROM pages ORDER BY timestamp DESC LIMIT 20`, logPrepareError);
+        viewStmt = db.prepare(`SELECT content, url, timestamp FROM pages WHERE id = ?`, logPrepareError);
+    });
+}
+
 // Check and create FTS5 table for efficient search (run once on startup)
 let isFtsReady = false;
 const dbWrite = new sqlite3.Database(DB_PATH, (err) => {
@@ -34,13 +64,26 @@ const dbWrite = new sqlite3.Database(DB_PATH, (err) => {
             if (err) console.error('Failed to enable WAL mode:', err.message);
         });
 
+        // Covering index for the LIKE fallback search, so scans read only
+        // title/url/timestamp instead of full rows with compressed HTML blobs.
+        // Newer archives ship with this already; create it for older ones.
+        dbWrite.exec('CREATE INDEX IF NOT EXISTS idx_search ON pages(title, url, timestamp);', (err) => {
+            if (err) console.error('Failed to create search index:', err.message);
+        });
+
+        // Lets the recent-pages query walk an index instead of sorting the
+        // whole table on every request.
+        dbWrite.exec('CREATE INDEX IF NOT EXISTS idx_timestamp ON pages(timestamp);', (err) => {
+            if (err) console.error('Failed to create timestamp index:', err.message);
+        });
+
         // Check if FTS table exists
         dbWrite.get("SELECT name FROM sqlite_master WHERE type='table' AND name='pages_fts'", (err, row) => {
             if (!row) {
                 console.log('Creating FTS5 table for fast search...');
                 console.log("Please wait till completion. This may take a while.");
                 dbWrite.exec(`
-                    CREATE VIRTUAL TABLE pages_fts USING fts5(title, url, content=pages, content_rowid=id);
+                    CREATE VIRTUAL TABLE pages_fts USING fts5(title, url, content=pages, content_rowid=id, prefix='2 3');
                     INSERT INTO pages_fts(rowid, title, url) SELECT id, title, url FROM pages;
                 `, (err) => {
                     if (err) {
@@ -53,8 +96,31 @@ const dbWrite = new sqlite3.Database(DB_PATH, (err) => {
                 });
             } else {
                 console.log('FTS5 table already exists.');
-                isFtsReady = true;
-                dbWrite.close();
+                // Top up the index with pages added since it was built (e.g. a
+                // refreshed archive.db). The docsize shadow table records which
+                // rowids are actually indexed; plain queries on an
+                // external-content FTS table would just read from pages.
+                dbWrite.get('SELECT IFNULL(MAX(id), 0) AS maxIndexed FROM pages_fts_docsize', (err, row) => {
+                    if (err) {
+                        console.error('Error checking FTS index state:', err.message);
+                        isFtsReady = true;
+                        dbWrite.close();
+                        return;
+                    }
+                    dbWrite.run(
+                        'INSERT INTO pages_fts(rowid, title, url) SELECT id, title, url FROM pages WHERE id > ?',
+                        [row.maxIndexed],
+                        function (err) {
+                            if (err) {
+                                console.error('Error updating FTS index:', err.message);
+                            } else if (this.changes > 0) {
+                                console.log(`Indexed ${this.changes} new pages for search.`);
+                            }
+                            isFtsReady = true;
+                            dbWrite.close();
+                        }
+                    );
+                });
             }
         });
     }
@@ -71,12 +137,14 @@ app.get('/', (req, res) => {
 // API: Search with FTS5
 app.get('/api/search', (req, res) => {
     const query = req.query.q;
-    if (!query) return res.json([]);
+    // Single characters match most of the archive and the LIKE fallback would
+    // scan the whole table for them; don't bother hitting the database.
+    if (!query || query.length < 2) return res.json([]);
 
     // Fallback search function
     const performFallbackSearch = () => {
-        const fallbackSql = `SELECT id, title, url, timestamp FROM pages WHERE title LIKE ? OR url LIKE ? LIMIT 50`;
-        db.all(fallbackSql, [`%${query}%`, `%${query}%`], (err, rows) => {
+        if (!fallbackSearchStmt) return res.status(500).json({ error: 'Archive database not ready' });
+        fallbackSearchStmt.all([`%${query}%`, `%${query}%`], (err, rows) => {
             if (err) return res.status(500).json({ error: err.message });
             res.json(rows);
         });
@@ -127,20 +195,68 @@ app.get('/api/search', (req, res) => {
 });
 
 // API: Recent
+// Optional from/to (epoch millis) restrict the window; both bounds resolve
+// through idx_timestamp, so a range query is two B-tree seeks rather than a
+// scan over every page.
 app.get('/api/recent', (req, res) => {
-    const sql = `SELECT id, title, url, timestamp FROM pages ORDER BY timestamp DESC LIMIT 20`;
-    db.all(sql, [], (err, rows) => {
+    const from = parseInt(req.query.from);
+    const to = parseInt(req.query.to);
+
+    if (!isNaN(from) || !isNaN(to)) {
+        const conditions = [];
+        const params = [];
+        if (!isNaN(from)) {
+            conditions.push('timestamp >= ?');
+            params.push(from);
+        }
+        if (!isNaN(to)) {
+            conditions.push('timestamp <= ?');
+            params.push(to);
+        }
+        const sql = `SELECT id, title, url, timestamp FROM pages WHERE ${conditions.join(' AND ')} ORDER BY timestamp DESC LIMIT 20`;
+        return db.all(sql, params, (err, rows) => {
+            if (err) return res.status(500).json({ error: err.message });
+            res.json(rows);
+        });
+    }
+
+    if (!recentStmt) return res.status(500).json({ error: 'Archive database not ready' });
+    recentStmt.all([], (err, rows) => {
         if (err) return res.status(500).json({ error: err.message });
         res.json(rows);
     });
 });
 
 // View Page
+// Sanitized pages are expensive to produce (gunzip plus a full DOM rewrite),
+// so keep the most recently viewed ones in memory; the archive is read-only,
+// making the cached output always valid.
+const viewCache = new Map();
+const VIEW_CACHE_MAX = 50;
+
+// Built once; toLocaleString with an options object constructs a new
+// formatter on every call.
+const archiveDateFormat = new Intl.DateTimeFormat('en-US', {
+    year: 'numeric',
+    month: 'short',
+    day: 'numeric',
+    hour: '2-digit',
+    minute: '2-digit'
+});
+
 app.get('/view/:id', (req, res) => {
     const id = req.params.id;
-    const sql = `SELECT content, url, timestamp FROM pages WHERE id = ?`;
 
-    db.get(sql, [id], (err, row) => {
+    const cached = viewCache.get(id);
+    if (cached) {
+        // Re-insert to mark as most recently used
+        viewCache.delete(id);
+        viewCache.set(id, cached);
+        return res.send(cached);
+    }
+
+    if (!viewStmt) return res.status(500).send('Database error');
+    viewStmt.get([id], (err, row) => {
         if (err) return res.status(500).send('Database error');
         if (!row) return res.status(404).send('Page not found');
 
@@ -153,10 +269,13 @@ app.get('/view/:id', (req, res) => {
             // Security: Remove all scripts and event handlers
             $('script').remove();
             $('*').each((i, el) => {
+                // Mutate the parsed node's attribute map directly; wrapping
+                // every element in $(el) just to call removeAttr allocates a
+                // cheerio object per element on what can be huge documents.
                 const attribs = el.attribs;
                 for (const name in attribs) {
                     if (name.startsWith('on')) {
-                        $(el).removeAttr(name);
+                        delete attribs[name];
                     }
                 }
             });
@@ -171,13 +290,7 @@ app.get('/view/:id', (req, res) => {
             $('head').append('<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>');
             $('head').append('<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;800&family=JetBrains+Mono:wght@400;700&display=swap" rel="stylesheet">');
 
-            const archiveDate = new Date(row.timestamp).toLocaleString('en-US', {
-                year: 'numeric',
-                month: 'short',
-                day: 'numeric',
-                hour: '2-digit',
-                minute: '2-digit'
-            });
+            const archiveDate = archiveDateFormat.format(new Date(row.timestamp));
 
             $('body').prepend(`
                 <div style="background: rgba(0,0,0,0.9); backdrop-filter: blur(10px); color: #00f2ff; padding: 15px 20px; border-bottom: 1px solid rgba(255,255,255,0.1); font-family: 'Inter', sans-serif; position: sticky; top: 0; z-index: 9999; margin-bottom: 20px;">
@@ -189,7 +302,12 @@ app.get('/view/:id', (req, res) => {
                 </div>
             `);
 
-            res.send($.html());
+            const rendered = $.html();
+            viewCache.set(id, rendered);
+            if (viewCache.size > VIEW_CACHE_MAX) {
+                viewCache.delete(viewCache.keys().next().value);
+            }
+            res.send(rendered);
         });
     });
 });
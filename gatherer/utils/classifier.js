@@ -3,51 +3,104 @@ const fs = require('fs');
 const path = require('path');
 require('dotenv').config({ path: path.join(__dirname, '../.env') });
 
+// Compiled once at module load; isLowQualityUrl runs for every discovered link.
+const AUTH_PATH_RE = /\/(login|logout|signin|signout|register|signup|auth)/;
+const PAGE_PATH_RE = /\/page\/(\d+)/;
+const PAGE_PARAM_RE = /[?&]page=(\d+)/;
+const NON_HTML_EXTS = new Set(['xml', 'json', 'rss', 'atom', 'ics', 'vcf', 'zip', 'tar', 'gz', 'exe', 'dmg', 'pkg']);
+
 class Classifier {
     constructor() {
         this.keywords = [];
+        this.keywordRegex = null;
         this.ignoredDomains = [];
+        this.ignoredDomainSet = new Set();
+        this.ignoredCache = new Map(); // hostname -> verdict, crawls revisit domains constantly
         this.loadConfig();
     }
 
+    // Read a newline-separated list file in a single pass (trim, lowercase,
+    // drop empties) instead of chained map/filter passes over intermediate arrays.
+    loadListFile(filePath) {
+        const entries = [];
+        for (const line of fs.readFileSync(filePath, 'utf8').split('\n')) {
+            const entry = line.trim().toLowerCase();
+            if (entry.length > 0) {
+                entries.push(entry);
+            }
+        }
+        return entries;
+    }
+
     loadConfig() {
         // Load Keywords
         const keywordsFile = process.env.KEYWORDS_FILE ? path.resolve(__dirname, '../', process.env.KEYWORDS_FILE) : path.resolve(__dirname, '../keywords.txt');
         try {
             if (fs.existsSync(keywordsFile)) {
-                this.keywords = fs.readFileSync(keywordsFile, 'utf8')
-                    .split('\n')
-                    .map(k => k.trim().toLowerCase())
-                    .filter(k => k.length > 0);
+                this.keywords = this.loadListFile(keywordsFile);
             }
         } catch (e) {
             console.error('Error loading keywords:', e.message);
         }
 
+        // Combine all keywords into one alternation so relevance checks are
+        // a single pass over the text instead of one scan per keyword.
+        if (this.keywords.length > 0) {
+            const escaped = this.keywords.map(k => k.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'));
+            this.keywordRegex = new RegExp(escaped.join('|'));
+        }
+
         // Load Ignored Domains
         const ignoredFile = process.env.IGNORED_DOMAINS_FILE ? path.resolve(__dirname, '../', process.env.IGNORED_DOMAINS_FILE) : path.resolve(__dirname, '../ignored_domains.txt');
         try {
             if (fs.existsSync(ignoredFile)) {
-                this.ignoredDomains = fs.readFileSync(ignoredFile, 'utf8')
-                    .split('\n')
-                    .map(d => d.trim().toLowerCase())
-                    .filter(d => d.length > 0);
+                this.ignoredDomains = this.loadListFile(ignoredFile);
             }
         } catch (e) {
             console.error('Error loading ignored domains:', e.message);
         }
+
+        this.ignoredDomainSet = new Set(this.ignoredDomains);
     }
 
     isRelevant(text) {
-        if (this.keywords.length === 0) return true; // If no keywords, assume all are relevant
-        const lowerText = text.toLowerCase();
-        return this.keywords.some(keyword => lowerText.includes(keyword));
+        if (!this.keywordRegex) return true; // If no keywords, assume all are relevant
+        return this.keywordRegex.test(text.toLowerCase());
     }
 
     isIgnored(url) {
         try {
-            const hostname = new URL(url).hostname;
-            return this.ignoredDomains.some(domain => hostname.endsWith(domain));
+            const fullHostname = new URL(url).hostname;
+
+            // Crawls hit the same hosts over and over; remember the verdict
+            // per hostname so only the first link from a host pays for the
+            // suffix walk.
+            const cached = this.ignoredCache.get(fullHostname);
+            if (cached !== undefined) return cached;
+
+            // Walk the hostname's label suffixes (a.b.c -> a.b.c, b.c, c) and
+            // test each against the set: O(labels) hash lookups instead of a
+            // linear endsWith scan over every ignored domain. Checking at label
+            // boundaries also stops "notfacebook.com" matching "facebook.com".
+            let hostname = fullHostname;
+            let ignored = false;
+            while (hostname) {
+                if (this.ignoredDomainSet.has(hostname)) {
+                    ignored = true;
+                    break;
+                }
+                const dot = hostname.indexOf('.');
+                if (dot === -1) break;
+                hostname = hostname.slice(dot + 1);
+            }
+
+            // Limit cache size
+            if (this.ignoredCache.size >= 10000) {
+                this.ignoredCache.delete(this.ignoredCache.keys().next().value);
+            }
+            this.ignoredCache.set(fullHostname, ignored);
+
+            return ignored;
         } catch (e) {
             return false;
         }
@@ -71,12 +124,12 @@ class Classifier {
             }
 
             // Login/logout/register pages
-            if (pathname.match(/\/(login|logout|signin|signout|register|signup|auth)/)) {
+            if (pathname.match(AUTH_PATH_RE)) {
                 return true;
             }
 
             // Deep pagination (>10 pages)
-            const pageMatch = pathname.match(/\/page\/(\d+)/) || search.match(/[?&]page=(\d+)/);
+            const pageMatch = pathname.match(PAGE_PATH_RE) || search.match(PAGE_PARAM_RE);
             if (pageMatch && parseInt(pageMatch[1]) > 10) {
                 return true;
             }
@@ -87,13 +140,17 @@ class Classifier {
             }
 
             // Too many query parameters
-            const paramCount = (search.match(/&/g) || []).length + (search.includes('?') ? 1 : 0);
+            let paramCount = search.includes('?') ? 1 : 0;
+            for (let i = search.indexOf('&'); i !== -1; i = search.indexOf('&', i + 1)) {
+                paramCount++;
+            }
             if (paramCount > 8) {
                 return true;
             }
 
             // Non-HTML file types
-            if (pathname.match(/\.(xml|json|rss|atom|ics|vcf|zip|tar|gz|exe|dmg|pkg)$/)) {
+            const dot = pathname.lastIndexOf('.');
+            if (dot !== -1 && NON_HTML_EXTS.has(pathname.slice(dot + 1))) {
                 return true;
             }
 
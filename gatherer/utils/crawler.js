@@ -1,4 +1,5 @@
 const EventEmitter = require('events');
+const crypto = require('crypto');
 const robotsParser = require('robots-parser');
 const scraper = require('./scraper');
 const classifier = require('./classifier');
@@ -12,11 +13,36 @@ const { logger } = require('./logger');
 
 const Queue = require('./queue');
 
+// Per-domain crawl throttling: once a domain exceeds a count threshold, its
+// pages are skipped with the paired probability. Ordered highest first; the
+// data drives the decision instead of a chain of compares in crawl().
+const DOMAIN_SKIP_PROBS = [
+    [50, 0.95],
+    [20, 0.8],
+    [10, 0.5],
+    [5, 0.2]
+];
+
+// languagedetect reports language names; map them to ISO codes once at module
+// load instead of rebuilding the table for every crawled page.
+const LANG_NAME_TO_CODE = {
+    'english': 'en',
+    'spanish': 'es',
+    'french': 'fr',
+    'german': 'de',
+    'italian': 'it',
+    'portuguese': 'pt',
+    'dutch': 'nl',
+    'russian': 'ru',
+    'chinese': 'zh',
+    'japanese': 'ja'
+};
+
 class Crawler extends EventEmitter {
     constructor() {
         super();
         this.queue = new Queue();
-        this.priorityQueue = [];
+        this.priorityQueue = new Queue(); // linked list: O(1) dequeue, unlike Array.shift
         this.visited = new Set();
         this.activeRequests = 0;
         this.maxConcurrency = parseInt(process.env.MAX_CONCURRENCY) || 5;
@@ -24,7 +50,7 @@ class Crawler extends EventEmitter {
         this.robotsCache = new Map(); // Domain -> RobotsParser instance
         this.isRunning = false;
         this.domainCounts = new Map(); // Domain -> count to prevent loops
-        this.acceptedLanguages = (process.env.ACCEPTED_LANGUAGES || 'en').split(',').map(l => l.trim().toLowerCase());
+        this.acceptedLanguages = new Set((process.env.ACCEPTED_LANGUAGES || 'en').split(',').map(l => l.trim().toLowerCase()));
         this.targetQueueSize = parseInt(process.env.TARGET_QUEUE_SIZE) || 1000;
         this.maxQueueSize = parseInt(process.env.MAX_QUEUE_SIZE) || 50000;
         this.maxVisitedSize = parseInt(process.env.MAX_VISITED_SIZE) || 100000; // Limit visited Set
@@ -67,6 +93,20 @@ class Crawler extends EventEmitter {
         }
     }
 
+    // Combined backlog across both queues; computed in one place instead of
+    // each call site summing the queues itself.
+    get pendingCount() {
+        return this.queue.size + this.priorityQueue.size;
+    }
+
+    // Fixed-size digest used as the visited-set key. URLs routinely run to
+    // hundreds of bytes and the set holds up to maxVisitedSize entries, so
+    // storing a short deterministic hash instead of the full string cuts the
+    // set's memory footprint several-fold.
+    urlKey(url) {
+        return crypto.createHash('sha1').update(url).digest('base64');
+    }
+
     normalizeUrl(url) {
         try {
             const u = new URL(url);
@@ -83,8 +123,9 @@ class Crawler extends EventEmitter {
 
     addToQueue(url, priority = false) {
         const normalizedUrl = this.normalizeUrl(url);
+        const visitedKey = this.urlKey(normalizedUrl);
 
-        if (this.visited.has(normalizedUrl)) return;
+        if (this.visited.has(visitedKey)) return;
 
         if (classifier.isIgnored(normalizedUrl)) {
             logger.info(`Ignored domain: ${normalizedUrl}`);
@@ -93,17 +134,17 @@ class Crawler extends EventEmitter {
 
         // Pre-process URLs to filter out low-quality ones
         if (classifier.isLowQualityUrl(normalizedUrl)) {
-            this.visited.add(normalizedUrl);
+            this.visited.add(visitedKey);
             return;
         }
 
         // Progressive queue management for variety while preventing RAM bloat
-        const currentQueueSize = this.queue.size + (this.priorityQueue ? this.priorityQueue.length : 0);
+        const currentQueueSize = this.pendingCount;
 
         if (!priority) {
             // Hard max - reject everything
             if (currentQueueSize >= this.maxQueueSize) {
-                this.visited.add(normalizedUrl);
+                this.visited.add(visitedKey);
                 return;
             }
 
@@ -114,20 +155,20 @@ class Crawler extends EventEmitter {
                 const dropRate = Math.min(0.95, (overTarget / rangeSize) * 0.95);
 
                 if (Math.random() < dropRate) {
-                    this.visited.add(normalizedUrl);
+                    this.visited.add(visitedKey);
                     return;
                 }
             }
         }
 
         if (priority) {
-            // Use a separate array for priority URLs (processed first in processQueue)
-            this.priorityQueue.push(normalizedUrl);
+            // Use a separate queue for priority URLs (processed first in processQueue)
+            this.priorityQueue.enqueue(normalizedUrl);
         } else {
             this.queue.enqueue(normalizedUrl);
         }
 
-        this.visited.add(normalizedUrl);
+        this.visited.add(visitedKey);
         this.processQueue();
     }
 
@@ -137,8 +178,8 @@ class Crawler extends EventEmitter {
 
         // Check priority queue first
         let url;
-        if (this.priorityQueue && this.priorityQueue.length > 0) {
-            url = this.priorityQueue.shift();
+        if (this.priorityQueue.size > 0) {
+            url = this.priorityQueue.dequeue();
         } else if (this.queue.size > 0) {
             url = this.queue.dequeue();
         } else {
@@ -168,10 +209,12 @@ class Crawler extends EventEmitter {
         const count = this.domainCounts.get(domain) || 0;
 
         let skipProb = 0;
-        if (count > 50) skipProb = 0.95;
-        else if (count > 20) skipProb = 0.8;
-        else if (count > 10) skipProb = 0.5;
-        else if (count > 5) skipProb = 0.2;
+        for (const [threshold, prob] of DOMAIN_SKIP_PROBS) {
+            if (count > threshold) {
+                skipProb = prob;
+                break;
+            }
+        }
 
         if (Math.random() < skipProb) {
             return;
@@ -193,34 +236,20 @@ class Crawler extends EventEmitter {
 
         if (parsed.lang) {
             const langCode = parsed.lang.split('-')[0].toLowerCase();
-            if (!acceptedLangs.some(l => langCode === l || (l === 'en' && langCode === 'en'))) {
-                if (!acceptedLangs.includes(langCode)) {
-                    logger.info(`Skipping content (lang=${parsed.lang}): ${url}`);
-                    return;
-                }
+            if (!acceptedLangs.has(langCode)) {
+                logger.info(`Skipping content (lang=${parsed.lang}): ${url}`);
+                return;
             }
         }
 
-        const detected = lngDetector.detect(parsed.text, 1);
+        // Detection cost grows with text length but its verdict is settled
+        // within the first few KB, so don't feed it whole articles.
+        const detected = lngDetector.detect(parsed.text.slice(0, 4000), 1);
         if (detected && detected.length > 0) {
             const detectedName = detected[0][0].toLowerCase();
+            const detectedCode = LANG_NAME_TO_CODE[detectedName] || detectedName;
 
-            const nameToCode = {
-                'english': 'en',
-                'spanish': 'es',
-                'french': 'fr',
-                'german': 'de',
-                'italian': 'it',
-                'portuguese': 'pt',
-                'dutch': 'nl',
-                'russian': 'ru',
-                'chinese': 'zh',
-                'japanese': 'ja'
-            };
-
-            const detectedCode = nameToCode[detectedName] || detectedName;
-
-            if (!acceptedLangs.includes(detectedCode)) {
+            if (!acceptedLangs.has(detectedCode)) {
                 logger.info(`Skipping content (detected=${detectedName}): ${url}`);
                 return;
             }
@@ -297,7 +326,7 @@ class Crawler extends EventEmitter {
     }
 
     trimQueue() {
-        const currentSize = this.queue.size + (this.priorityQueue ? this.priorityQueue.length : 0);
+        const currentSize = this.pendingCount;
         if (currentSize > this.maxQueueSize) {
             const toRemove = currentSize - this.targetQueueSize;
             logger.info(`Queue oversized (${currentSize}), trimming ${toRemove} items to target...`);
@@ -306,7 +335,7 @@ class Crawler extends EventEmitter {
                 this.queue.dequeue();
             }
 
-            logger.info(`Queue trimmed to ${this.queue.size + (this.priorityQueue ? this.priorityQueue.length : 0)}`);
+            logger.info(`Queue trimmed to ${this.pendingCount}`);
         }
     }
 
@@ -329,7 +358,7 @@ class Crawler extends EventEmitter {
 
     getStats() {
         return {
-            queueLength: this.queue.size + (this.priorityQueue ? this.priorityQueue.length : 0),
+            queueLength: this.pendingCount,
             visitedCount: this.visited.size,
             activeRequests: this.activeRequests
         };
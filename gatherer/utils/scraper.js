@@ -10,19 +10,42 @@ const logger = winston.createLogger({
     transports: [new winston.transports.Console()]
 });
 
+// Non-content elements stripped before text extraction; joined once at module load.
+const NOISE_SELECTOR = [
+    'script', 'style', 'noscript', 'iframe', 'svg', 'nav', 'footer', 'header', 'aside',
+    '.sidebar', '.menu', '.ad', '.advertisement', '.cookie-notice', '.popup', '.modal',
+    '.comments', '.related-posts', '.social-share', '.share-buttons', '.newsletter',
+    '.breadcrumbs', '.breadcrumb', '.toc', '.widget', '.search-form', 'form', 'button',
+    // Common Ad patterns
+    '[id*="google_ads"]', '[class*="google_ads"]', '.adsbygoogle',
+    '[class*="sponsored"]', '[id*="sponsored"]',
+    '.outbrain', '.taboola', '.zemanta',
+    // Wikipedia specific
+    '.mw-jump-link', '.mw-editsection', '.reference', '.reflist', '.portal', '.catlinks',
+    '#mw-navigation', '#footer', '.mw-footer', '.printfooter', '.authority-control',
+    '.mw-cite-backlink', '#siteNotice', '.mw-indicators'
+].join(', ');
+
+// Images are only kept when src/alt/title suggest reference material; one
+// alternation so each image is a single scan instead of one per keyword.
+const IMAGE_KEYWORD_RE = /map|chart|diagram|schematic|guide|survival|technique|knot|plant|mushroom/;
+
 class Scraper {
     constructor() {
         this.userAgent = process.env.USER_AGENT || 'WorldEndArchive/1.0';
+        // Same for every request; share one object instead of rebuilding it
+        // per fetch. axios only reads from it.
+        this.defaultHeaders = {
+            'User-Agent': this.userAgent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5'
+        };
     }
 
     async fetchPage(url) {
         const proxy = proxyManager.getProxy();
         const config = {
-            headers: {
-                'User-Agent': this.userAgent,
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5'
-            },
+            headers: this.defaultHeaders,
             validateStatus: status => status < 500
         };
 
@@ -115,22 +138,7 @@ class Scraper {
         const $ = cheerio.load(html);
 
         // Aggressive cleanup of non-content elements
-        const noiseSelectors = [
-            'script', 'style', 'noscript', 'iframe', 'svg', 'nav', 'footer', 'header', 'aside',
-            '.sidebar', '.menu', '.ad', '.advertisement', '.cookie-notice', '.popup', '.modal',
-            '.comments', '.related-posts', '.social-share', '.share-buttons', '.newsletter',
-            '.breadcrumbs', '.breadcrumb', '.toc', '.widget', '.search-form', 'form', 'button',
-            // Common Ad patterns
-            '[id*="google_ads"]', '[class*="google_ads"]', '.adsbygoogle',
-            '[class*="sponsored"]', '[id*="sponsored"]',
-            '.outbrain', '.taboola', '.zemanta',
-            // Wikipedia specific
-            '.mw-jump-link', '.mw-editsection', '.reference', '.reflist', '.portal', '.catlinks',
-            '#mw-navigation', '#footer', '.mw-footer', '.printfooter', '.authority-control',
-            '.mw-cite-backlink', '#siteNotice', '.mw-indicators'
-        ];
-
-        $(noiseSelectors.join(', ')).remove();
+        $(NOISE_SELECTOR).remove();
 
         let content = $('main, article, #content, .content, .post-body, #mw-content-text').first();
         if (content.length === 0) {
@@ -163,9 +171,8 @@ class Scraper {
             const titleAttr = $(el).attr('title') || '';
 
             const combined = `${src} ${alt} ${titleAttr}`.toLowerCase();
-            const keywords = ['map', 'chart', 'diagram', 'schematic', 'guide', 'survival', 'technique', 'knot', 'plant', 'mushroom'];
 
-            if (keywords.some(k => combined.includes(k))) {
+            if (IMAGE_KEYWORD_RE.test(combined)) {
                 try {
                     const absoluteUrl = new URL(src, baseUrl).href;
                     if (absoluteUrl.startsWith('http')) {
@@ -11,6 +11,9 @@ const logger = winston.createLogger({
     transports: [new winston.transports.Console()]
 });
 
+// Characters in an ISO timestamp that are unsafe in filenames
+const FILENAME_UNSAFE_RE = /[:.]/g;
+
 class StorageManager {
     constructor() {
         this.outputDir = process.env.OUTPUT_DIR ? path.resolve(__dirname, '../', process.env.OUTPUT_DIR) : path.resolve(__dirname, '../output');
@@ -18,8 +21,96 @@ class StorageManager {
         this.txtPath = path.join(this.outputDir, 'archive.txt');
         this.maxTxtSize = (parseInt(process.env.MAX_TXT_SIZE_MB) || 50) * 1024 * 1024;
 
+        this.txtStream = null;
+        this.rotating = false; // a rotation's close-then-rename is in flight
+        this.pendingEntries = []; // TXT entries held back during a rotation
+        this.seenUrls = new Set(); // URLs already archived, for O(1) duplicate checks
+        this.pageCount = 0; // live page count, seeded from the DB at startup
+
         this.initDir();
         this.initDB();
+
+        // Current TXT size, tracked in memory so the rotation check doesn't
+        // stat the file on every save. Stat once to pick up an existing file.
+        try {
+            this.txtSize = fs.statSync(this.txtPath).size;
+        } catch (e) {
+            this.txtSize = 0;
+        }
+    }
+
+    getTxtStream() {
+        if (!this.txtStream) {
+            // 1 MiB buffer so bursts of pages coalesce into few large writes
+            // instead of one small write per page.
+            this.txtStream = fs.createWriteStream(this.txtPath, {
+                flags: 'a',
+                highWaterMark: 1024 * 1024
+            });
+            this.txtStream.on('error', (err) => {
+                logger.error(`TXT stream error: ${err.message}`);
+                this.txtStream = null;
+            });
+        }
+        return this.txtStream;
+    }
+
+    writeTxtEntry(entry) {
+        // While a rotation is in flight the file must not be written to or
+        // recreated, so hold entries until the rename has finished.
+        if (this.rotating) {
+            this.pendingEntries.push(entry);
+            return;
+        }
+
+        if (this.txtSize >= this.maxTxtSize) {
+            this.pendingEntries.push(entry);
+            this.rotateTxt();
+            return;
+        }
+
+        this.getTxtStream().write(entry);
+        this.txtSize += entry.length;
+    }
+
+    // Move the full TXT file aside so appends start a fresh one. end() closes
+    // the stream's descriptor asynchronously, and renaming a still-open file
+    // fails on Windows, so the rename runs in the close callback; entries that
+    // arrive in the meantime are buffered and flushed afterwards.
+    rotateTxt() {
+        this.rotating = true;
+        const stream = this.txtStream;
+        this.txtStream = null;
+
+        const finishRotation = () => {
+            try {
+                const stamp = new Date().toISOString().replace(FILENAME_UNSAFE_RE, '-');
+                const newPath = path.join(this.outputDir, `archive_${stamp}.txt`);
+                fs.renameSync(this.txtPath, newPath);
+                this.txtSize = 0;
+                logger.info(`Rotated TXT file to ${newPath}`);
+            } catch (e) {
+                // Keep appending to the oversized file; the next save retries.
+                logger.error(`Error rotating TXT file: ${e.message}`);
+            }
+            this.rotating = false;
+
+            // Flush held-back entries directly (no size check), so a failed
+            // rename can't re-trigger the rotation in a loop and no entry is
+            // ever dropped.
+            const pending = this.pendingEntries;
+            this.pendingEntries = [];
+            for (const entry of pending) {
+                this.getTxtStream().write(entry);
+                this.txtSize += entry.length;
+            }
+        };
+
+        if (stream) {
+            stream.end(finishRotation);
+        } else {
+            finishRotation();
+        }
     }
 
     initDir() {
@@ -49,6 +140,11 @@ class StorageManager {
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
             );
             CREATE INDEX IF NOT EXISTS idx_url ON pages(url);
+            -- Covering index for title/url search: scans touch only these
+            -- columns instead of full rows with their compressed HTML blobs.
+            CREATE INDEX IF NOT EXISTS idx_search ON pages(title, url, timestamp);
+            -- Serves ORDER BY timestamp DESC (recent pages) as an index walk.
+            CREATE INDEX IF NOT EXISTS idx_timestamp ON pages(timestamp);
 
             CREATE TABLE IF NOT EXISTS images (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -62,6 +158,33 @@ class StorageManager {
         this.db.exec(sql, (err) => {
             if (err) {
                 logger.error(`Error creating tables: ${err.message}`);
+            } else {
+                this.loadSeenUrls();
+            }
+        });
+    }
+
+    // Pre-populate the duplicate-check set from an existing archive so a
+    // restarted gatherer doesn't re-save pages that are already in the DB.
+    // Rows are streamed with db.each rather than collected via db.all, so a
+    // large archive never materializes a second full copy of its URLs.
+    loadSeenUrls() {
+        let count = 0;
+        this.db.each('SELECT url FROM pages', (err, row) => {
+            if (err) {
+                logger.error(`Error loading archived URL: ${err.message}`);
+                return;
+            }
+            this.seenUrls.add(row.url);
+            count++;
+        }, (err) => {
+            if (err) {
+                logger.error(`Error loading archived URLs: ${err.message}`);
+                return;
+            }
+            this.pageCount = count;
+            if (count > 0) {
+                logger.info(`Loaded ${count} archived URLs for duplicate checks.`);
             }
         });
     }
@@ -69,19 +192,25 @@ class StorageManager {
     async savePage(pageData) {
         // logger.info(`Saving page: ${pageData.url}`);
 
-        try {
-            if (fs.existsSync(this.txtPath)) {
-                const stats = fs.statSync(this.txtPath);
-                if (stats.size >= this.maxTxtSize) {
-                    const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
-                    const newPath = path.join(this.outputDir, `archive_${timestamp}.txt`);
-                    fs.renameSync(this.txtPath, newPath);
-                    logger.info(`Rotated TXT file to ${newPath}`);
-                }
-            }
+        // Skip already-archived URLs before doing any compression or I/O.
+        // The DB's INSERT OR IGNORE would catch these too, but only after
+        // the page has been gzipped and appended to the TXT archive.
+        if (this.seenUrls.has(pageData.url)) {
+            return;
+        }
+        this.seenUrls.add(pageData.url);
+
+        // One clock read per page; the same instant is used for the TXT entry
+        // and the DB row.
+        const now = new Date();
+        const nowIso = now.toISOString();
 
-            const entry = `\n\n=== ${pageData.title} ===\nURL: ${pageData.url}\nDate: ${new Date().toISOString()}\n\n${pageData.text}\n\n==================\n`;
-            fs.appendFileSync(this.txtPath, entry);
+        try {
+            // Encode once: the same buffer provides the byte count for rotation
+            // tracking and goes to the stream, instead of Buffer.byteLength
+            // measuring the string and write() encoding it a second time.
+            const entry = Buffer.from(`\n\n=== ${pageData.title} ===\nURL: ${pageData.url}\nDate: ${nowIso}\n\n${pageData.text}\n\n==================\n`);
+            this.writeTxtEntry(entry);
             logger.info(`Saved to TXT: ${pageData.url}`);
         } catch (e) {
             logger.error(`Error writing to TXT: ${e.message}`);
@@ -93,11 +222,16 @@ class StorageManager {
                 return;
             }
 
+            const self = this;
             this.db.run(`INSERT OR IGNORE INTO pages (url, title, content, timestamp) VALUES (?, ?, ?, ?)`,
-                [pageData.url, pageData.title, buffer, Date.now()],
-                (err) => {
-                    if (err) logger.error(`DB Error: ${err.message}`);
-                    else logger.info(`Saved to DB: ${pageData.url}`);
+                [pageData.url, pageData.title, buffer, now.getTime()],
+                function (err) {
+                    if (err) {
+                        logger.error(`DB Error: ${err.message}`);
+                    } else {
+                        if (this.changes > 0) self.pageCount++;
+                        logger.info(`Saved to DB: ${pageData.url}`);
+                    }
                 }
             );
         });
@@ -114,32 +248,22 @@ class StorageManager {
     }
 
     getStats(callback) {
-        this.db.get("SELECT COUNT(*) as count FROM pages", (err, row) => {
-            if (err) {
-                callback({ count: 0, size: 0 });
-            } else {
-                // Get TXT size
-                let txtSize = 0;
-                try {
-                    if (fs.existsSync(this.txtPath)) {
-                        txtSize = fs.statSync(this.txtPath).size;
-                    }
-                } catch (e) { }
-
-                // Get DB size
-                let dbSize = 0;
-                try {
-                    if (fs.existsSync(this.dbPath)) {
-                        dbSize = fs.statSync(this.dbPath).size;
-                    }
-                } catch (e) { }
+        // The page count is maintained in memory (seeded at startup,
+        // incremented per insert), so the dashboard's 2-second polling no
+        // longer runs COUNT(*) over the whole table.
 
-                callback({
-                    count: row.count,
-                    txtSize: txtSize,
-                    dbSize: dbSize
-                });
+        // Get DB size
+        let dbSize = 0;
+        try {
+            if (fs.existsSync(this.dbPath)) {
+                dbSize = fs.statSync(this.dbPath).size;
             }
+        } catch (e) { }
+
+        callback({
+            count: this.pageCount,
+            txtSize: this.txtSize,
+            dbSize: dbSize
         });
     }
 }
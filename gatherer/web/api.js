@@ -1,5 +1,7 @@
 const express = require('express');
 const path = require('path');
+const fs = require('fs');
+const archiver = require('archiver');
 const crawler = require('../utils/crawler');
 const storage = require('../utils/storage');
 require('dotenv').config({ path: path.join(__dirname, '../../.env') });
@@ -9,19 +11,27 @@ const { logger, logStream } = require('../utils/logger');
 const router = express.Router();
 
 // SSE Endpoint for logs
+// Serialize each log event once and broadcast it, instead of running
+// JSON.stringify per connected client.
+const sseClients = new Set();
+
+logStream.on('log', (data) => {
+    if (sseClients.size === 0) return;
+    const payload = `data: ${JSON.stringify(data)}\n\n`;
+    for (const client of sseClients) {
+        client.write(payload);
+    }
+});
+
 router.get('/logs/stream', (req, res) => {
     res.setHeader('Content-Type', 'text/event-stream');
     res.setHeader('Cache-Control', 'no-cache');
     res.setHeader('Connection', 'keep-alive');
 
-    const onLog = (data) => {
-        res.write(`data: ${JSON.stringify(data)}\n\n`);
-    };
-
-    logStream.on('log', onLog);
+    sseClients.add(res);
 
     req.on('close', () => {
-        logStream.off('log', onLog);
+        sseClients.delete(res);
     });
 });
 
@@ -58,14 +68,18 @@ router.post('/add-url', express.json(), (req, res) => {
 
 
 // Download endpoints
-router.get('/download/txt', (req, res) => {
-    const archiver = require('archiver');
+router.get('/download/txt', async (req, res) => {
     const outputDir = storage.outputDir;
 
-    // Find all TXT archive files
-    const files = fs.readdirSync(outputDir).filter(f =>
-        f === 'archive.txt' || f.startsWith('archive_') && f.endsWith('.txt')
-    );
+    // Find all TXT archive files (async so large output dirs don't block the event loop)
+    let files;
+    try {
+        files = (await fs.promises.readdir(outputDir)).filter(f =>
+            f === 'archive.txt' || f.startsWith('archive_') && f.endsWith('.txt')
+        );
+    } catch (e) {
+        return res.status(500).send('Error reading archive directory.');
+    }
 
     if (files.length === 0) {
         return res.status(404).send('No archive files found yet.');
@@ -95,22 +109,10 @@ router.get('/download/db', (req, res) => {
     }
 });
 
-// Download offline package (client + DB + TXT for USB)
-router.get('/download/offline-package', async (req, res) => {
-    const archiver = require('archiver');
-    const os = require('os');
-    const { promisify } = require('util');
-    const { exec } = require('child_process');
-    const execAsync = promisify(exec);
-
-    try {
-        const archive = archiver('zip', { zlib: { level: 6 } });
-        res.attachment('WorldEndArchive_Offline.zip');
-        archive.pipe(res);
-
-
-        // README for emergency use (no internet assumed)
-        const readme = `╔══════════════════════════════════════════════════════════════╗
+// Static documents bundled into the offline package, built once at module
+// load instead of on every download request.
+// README for emergency use (no internet assumed)
+const readme = `╔══════════════════════════════════════════════════════════════╗
 ║                  WORLDENDARCHIVE                             ║
 ║              Preserved Knowledge Repository                  ║
 ╚══════════════════════════════════════════════════════════════╝
@@ -279,8 +281,8 @@ for when it might be needed most.
 Use it wisely. Share it freely.
 `;
 
-        // Installation guide for preparing the USB (while internet exists)
-        const installation = `╔══════════════════════════════════════════════════════════════╗
+// Installation guide for preparing the USB (while internet exists)
+const installation = `╔══════════════════════════════════════════════════════════════╗
 ║           WORLDENDARCHIVE - INSTALLATION GUIDE               ║
 ║              How to Prepare the USB Stick                    ║
 ╚══════════════════════════════════════════════════════════════╝
@@ -378,6 +380,15 @@ Prepare now. Hope you never need it.
 For more info: github.com/neooriginal/WorldEndArchive
 `;
 
+// Download offline package (client + DB + TXT for USB)
+router.get('/download/offline-package', async (req, res) => {
+    try {
+        const archive = archiver('zip', { zlib: { level: 6 } });
+        res.attachment('WorldEndArchive_Offline.zip');
+        archive.pipe(res);
+
+
+
         archive.append(readme, { name: 'README.txt' });
         archive.append(installation, { name: 'INSTALLATION.txt' });
 
@@ -401,7 +412,7 @@ For more info: github.com/neooriginal/WorldEndArchive
 
         // Add all TXT files
         const outputDir = storage.outputDir;
-        const txtFiles = fs.readdirSync(outputDir).filter(f =>
+        const txtFiles = (await fs.promises.readdir(outputDir)).filter(f =>
             f === 'archive.txt' || (f.startsWith('archive_') && f.endsWith('.txt'))
         );
 
@@ -435,4 +446,3 @@ function startServer() {
 }
 
 module.exports = { startServer, app, logger };
-const fs = require('fs'); // Added missing require
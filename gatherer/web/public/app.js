@@ -20,15 +20,41 @@ document.addEventListener('DOMContentLoaded', () => {
             .catch(err => console.error('Error fetching stats:', err));
     }
 
+    // Log messages arrive in bursts while the crawler is busy; buffer them and
+    // touch the DOM once per animation frame instead of once per message.
+    let pendingLogs = [];
+    let logFlushScheduled = false;
+
     function addLog(message, level = 'info') {
-        const entry = document.createElement('div');
-        entry.className = `log-entry log-${level}`;
-        const time = new Date().toLocaleTimeString();
-        entry.innerHTML = `<span class="log-time">[${time}]</span> <span class="log-msg">${message}</span>`;
-        logContainer.prepend(entry);
+        pendingLogs.push({ message, level, time: new Date().toLocaleTimeString() });
+        // Only 50 entries survive in the DOM anyway; capping the buffer keeps
+        // it from growing without bound while the tab is hidden (rAF doesn't
+        // fire there, so the flush can be deferred indefinitely).
+        if (pendingLogs.length > 50) {
+            pendingLogs.shift();
+        }
+        if (!logFlushScheduled) {
+            logFlushScheduled = true;
+            requestAnimationFrame(flushLogs);
+        }
+    }
+
+    function flushLogs() {
+        logFlushScheduled = false;
+        const fragment = document.createDocumentFragment();
+        // Newest first, matching the prepend order of individual entries
+        for (let i = pendingLogs.length - 1; i >= 0; i--) {
+            const { message, level, time } = pendingLogs[i];
+            const entry = document.createElement('div');
+            entry.className = `log-entry log-${level}`;
+            entry.innerHTML = `<span class="log-time">[${time}]</span> <span class="log-msg">${message}</span>`;
+            fragment.appendChild(entry);
+        }
+        pendingLogs = [];
+        logContainer.prepend(fragment);
 
         // Keep only last 50 logs to prevent DOM bloat
-        if (logContainer.children.length > 50) {
+        while (logContainer.children.length > 50) {
             logContainer.lastChild.remove();
         }
     }